@@ -5,10 +5,88 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup # type: ignore
-import requests
+import aiohttp
+import asyncio
+import socket
+import ssl
 import threading
-from queue import Queue
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from urllib.parse import urlsplit, urlunsplit
+
+
+DNS_CACHE_TTL = 60
+DNS_STALE_TTL = 24 * 60 * 60
+MAX_CONCURRENT_CHECKS = 100
+MAX_CHECKS_PER_HOST = 3
+RESOLVER_WORKERS = 32
+UI_REFRESH_MS = 100
+UI_MAX_LOG_LINES = 200
+# Servers that reject HEAD with these codes get a one-byte GET instead
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class CachedResolver:
+    """TTL cache in front of getaddrinfo that serves stale answers when resolution fails"""
+
+    __slots__ = ("resolve", "ttl", "stale_ttl", "cache", "lock")
+
+    def __init__(self, resolve, ttl=DNS_CACHE_TTL, stale_ttl=DNS_STALE_TTL):
+        self.resolve = resolve
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def getaddrinfo(self, host, port, *args, **kwargs):
+        """Drop-in replacement for socket.getaddrinfo"""
+        key = (host, port, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self.lock:
+            entry = self.cache.get(key)
+        if entry and entry[1] > now:
+            return entry[0]
+        try:
+            result = self.resolve(host, port, *args, **kwargs)
+        except OSError:
+            # Serve the expired answer for a while rather than fail (RFC 8767)
+            if entry and entry[1] + self.stale_ttl > now:
+                return entry[0]
+            raise
+        with self.lock:
+            self.cache[key] = (result, now + self.ttl)
+        return result
+
+
+dns_resolver = CachedResolver(socket.getaddrinfo)
+socket.getaddrinfo = dns_resolver.getaddrinfo
+
+
+def normalize_url(url):
+    """Normalize URL so equivalent bookmarks are checked only once"""
+    try:
+        parts = urlsplit(url or "")
+        port = parts.port
+    except ValueError:
+        return url or ""
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if port is not None and port == DEFAULT_PORTS.get(scheme):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunsplit((scheme, netloc, parts.path, parts.query, ""))
+
+
+def group_by_pair(titles, hrefs):
+    """Group indexes of (title, href) pairs that occur more than once"""
+    keys = list(zip(titles, hrefs))
+    counts = Counter(keys)
+    groups = defaultdict(list)
+    for i, key in enumerate(keys):
+        if counts[key] > 1:
+            groups[key].append(i)
+    return groups
 
 
 class BookmarkManager:
@@ -16,14 +94,28 @@ class BookmarkManager:
         self.root = root
         self.soup = None
         self.file_path = None
+        self.a_tags = []
+        self.paths = None
+        self.dl_tags = []
+        self.dirty = False
+        self.path_by_dl = None
         self.log_box = None
         self.status_labels = {}
         self.invalid_bookmarks = []
         self.duplicate_bookmarks = []
-        self.lock = threading.Lock()
-        self.threads = []
+        self.log_queue = deque()
+        self.progress = None
+        self.shown_progress = None
         self.is_running = False
+        self.session = None
+        self.check_future = None
+        self.loop = asyncio.new_event_loop()
+        # aiohttp resolves host names through getaddrinfo on the loop's default executor
+        self.executor = ThreadPoolExecutor(max_workers=RESOLVER_WORKERS, thread_name_prefix="resolver")
+        self.loop.set_default_executor(self.executor)
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
         self.setup_ui()
+        self.root.after(UI_REFRESH_MS, self.flush_ui)
 
     def setup_ui(self):
         self.root.title("Bookmark Manager")
@@ -51,11 +143,33 @@ class BookmarkManager:
         self.log_box.pack(fill="both", expand=True, padx=5, pady=5)
 
     def log(self, message):
-        """Log message to UI text box"""
-        with self.lock:
-            self.log_box.insert("end", f"{message}\n")
+        """Queue message for the UI text box (safe to call from any thread)"""
+        self.log_queue.append(message)
+
+    def set_progress(self, checked, valid, invalid, total):
+        """Publish check progress for the next UI refresh"""
+        # Only the checker loop writes progress, and rebinding one attribute is atomic
+        self.progress = (checked, valid, invalid, total)
+
+    def flush_ui(self):
+        """Write queued log lines and redraw counters, then reschedule"""
+        lines = []
+        for _ in range(UI_MAX_LOG_LINES):
+            try:
+                lines.append(self.log_queue.popleft())
+            except IndexError:
+                break
+        if lines:
+            self.log_box.insert("end", "\n".join(lines) + "\n")
             self.log_box.see("end")
 
+        progress = self.progress
+        if progress is not None and progress != self.shown_progress:
+            self.update_status(*progress)
+            self.shown_progress = progress
+
+        self.root.after(UI_REFRESH_MS, self.flush_ui)
+
     def load_bookmarks(self):
         """Load bookmarks file"""
         if self.is_running:
@@ -65,36 +179,107 @@ class BookmarkManager:
         if not file_path:
             self.log("No file selected.")
             return
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                self.soup = BeautifulSoup(file, "html.parser")
-                self.file_path = file_path
-                self.log(f"Successfully loaded bookmarks file: {file_path}")
-        except Exception as e:
-            self.log(f"Error loading file: {e}")
+
+        self.is_running = True
+        self.log(f"Loading bookmarks file: {file_path}")
+
+        def do_load():
+            try:
+                with open(file_path, "rb") as file:
+                    soup = BeautifulSoup(file.read(), "html.parser", from_encoding="utf-8")
+            except Exception as e:
+                self.root.after(0, on_loaded, None, e)
+            else:
+                self.root.after(0, on_loaded, soup, None)
+
+        def on_loaded(soup, error):
+            self.is_running = False
+            if error is not None:
+                self.log(f"Error loading file: {error}")
+                return
+            self.soup = soup
+            self.file_path = file_path
+            self.path_by_dl = None
+            self.index_tags()
+            self.log(f"Successfully loaded bookmarks file: {file_path}")
+
+        threading.Thread(target=do_load, daemon=True).start()
 
     def update_status(self, checked, valid, invalid, total):
         """Update status display"""
-        with self.lock:
-            self.status_labels["checked"].config(text=f"Checked: {checked}")
-            self.status_labels["valid"].config(text=f"Valid: {valid}")
-            self.status_labels["invalid"].config(text=f"Invalid: {invalid}")
-            self.status_labels["pending"].config(text=f"Pending: {total - checked}")
+        self.status_labels["checked"].config(text=f"Checked: {checked}")
+        self.status_labels["valid"].config(text=f"Valid: {valid}")
+        self.status_labels["invalid"].config(text=f"Invalid: {invalid}")
+        self.status_labels["pending"].config(text=f"Pending: {total - checked}")
+
+    async def get_session(self):
+        """Get the HTTP session shared by all checks (created on first use)"""
+        if self.session is None:
+            # One TLS context for every HTTPS check, with session tickets left enabled
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = True
+            ssl_context.options &= ~ssl.OP_NO_TICKET
+            connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_CHECKS, limit_per_host=6, ttl_dns_cache=DNS_CACHE_TTL, ssl=ssl_context)
+            timeout = aiohttp.ClientTimeout(total=10)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
+
+    async def close_session(self):
+        """Close the shared HTTP session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def shutdown(self):
+        """Close the shared HTTP session and stop the checker loop"""
+        await self.close_session()
+        self.loop.stop()
+
+    def index_tags(self):
+        """Cache bookmark and folder tags of the loaded file"""
+        self.a_tags = self.soup.find_all("a")
+        self.paths = None
+        self.dl_tags = self.soup.find_all("dl")
+        self.dirty = False
+
+    def get_a_tags(self):
+        """Get cached bookmark tags, rescanning only after deletions"""
+        if self.dirty:
+            self.index_tags()
+        return self.a_tags
+
+    def get_paths(self):
+        """Get folder paths of the cached bookmark tags, in the same order"""
+        a_tags = self.get_a_tags()
+        if self.paths is None:
+            self.paths = [self.get_bookmark_path(a_tag) for a_tag in a_tags]
+        return self.paths
+
+    def remove_tags(self, tags):
+        """Remove tags from the document and mark the tag cache for a rescan"""
+        for tag in tags:
+            tag.decompose()
+        self.dirty = True
+
+    def build_path_index(self):
+        """Map every folder <dl> to its folder path in one pass over the document"""
+        self.path_by_dl = {}
+        # dl_tags is in document order, so parents are indexed before children
+        for dl in self.dl_tags:
+            path = self.path_by_dl.get(id(dl.find_parent("dl")), ())
+            folder = dl.find_previous_sibling("h3")
+            if folder:
+                path += (folder.text.strip(),)
+            self.path_by_dl[id(dl)] = path
 
     def get_bookmark_path(self, a_tag):
         """Get complete path of bookmark"""
-        path = []
-        parent = a_tag.parent
-        while parent and parent.name:
-            if parent.name == "dl":
-                folder = parent.find_previous_sibling("h3")
-                if folder:
-                    path.append(folder.text.strip())
-            parent = parent.parent
-        return " > ".join(reversed(path))
+        if self.path_by_dl is None:
+            self.build_path_index()
+        return " > ".join(self.path_by_dl.get(id(a_tag.find_parent("dl")), ()))
 
     def check_bookmark_validity(self):
-        """Check bookmark validity (multi-threaded)"""
+        """Check bookmark validity (asyncio on a background thread)"""
         if self.is_running:
             messagebox.showwarning("Warning", "Operation in progress, please wait!")
             return
@@ -104,78 +289,99 @@ class BookmarkManager:
 
         self.is_running = True
         self.invalid_bookmarks = []
-        bookmarks = []
+        a_tags = self.get_a_tags()
+        paths = self.get_paths()
+        groups = defaultdict(list)
         
-        # Collect all bookmarks and their paths
-        for a_tag in self.soup.find_all("a"):
-            path = self.get_bookmark_path(a_tag)
-            bookmarks.append((a_tag, path))
+        # Group bookmark indexes by normalized URL
+        for i, a_tag in enumerate(a_tags):
+            groups[normalize_url(a_tag.get("href"))].append(i)
             
-        total = len(bookmarks)
+        total = len(a_tags)
         checked, valid, invalid = 0, 0, 0
-
-        def worker(queue):
-            nonlocal checked, valid, invalid
-            while not queue.empty():
-                a_tag, path = queue.get()
-                href = a_tag.get("href")
+        self.set_progress(checked, valid, invalid, total)
+
+        async def check(session, url):
+            async with session.head(url, allow_redirects=True) as response:
+                status = response.status
+            if status in HEAD_FALLBACK_STATUSES:
+                async with session.get(url, headers={"Range": "bytes=0-0"}, allow_redirects=True) as response:
+                    status = response.status
+            return status
+
+        async def run_checks():
+            session = await self.get_session()
+            global_sem = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+            host_sems = defaultdict(lambda: asyncio.Semaphore(MAX_CHECKS_PER_HOST))
+
+            async def check_one(url, indexes):
+                nonlocal checked, valid, invalid
+                href = a_tags[indexes[0]].get("href")
                 try:
-                    response = requests.head(href, timeout=5)
-                    if response.status_code < 400:
+                    host = urlsplit(url).netloc
+                    async with host_sems[host], global_sem:
+                        status = await check(session, href)
+                except Exception:
+                    status = None
+
+                # Apply the result to every bookmark sharing this URL
+                for i in indexes:
+                    if status is not None and status < 400:
                         valid += 1
                     else:
                         invalid += 1
-                        self.invalid_bookmarks.append((a_tag, path))
-                except:
-                    invalid += 1
-                    self.invalid_bookmarks.append((a_tag, path))
-
-                checked += 1
-                self.update_status(checked, valid, invalid, total)
-                location = f" (Location: {path})" if path else ""
-                self.log(f"Checking bookmark: {href}{location}")
-                queue.task_done()
-
-        queue = Queue()
-        for bookmark in bookmarks:
-            queue.put(bookmark)
-
-        # Create threads
-        for _ in range(10):
-            thread = threading.Thread(target=worker, args=(queue,), daemon=True)
-            self.threads.append(thread)
-            thread.start()
-
-        def on_complete():
-            queue.join()
+                        self.invalid_bookmarks.append(i)
+                    checked += 1
+                    location = f" (Location: {paths[i]})" if paths[i] else ""
+                    self.log(f"Checking bookmark: {href}{location}")
+                self.set_progress(checked, valid, invalid, total)
+
+            await asyncio.gather(*(check_one(url, indexes) for url, indexes in groups.items()))
+
+        def on_complete(error):
             self.is_running = False
+            if error is not None:
+                self.log(f"Error checking bookmarks: {error}")
             self.log("Check completed!")
             if self.invalid_bookmarks:
                 self.ask_delete_invalid_bookmarks()
 
-        threading.Thread(target=on_complete, daemon=True).start()
+        def on_done(future):
+            # A cancelled check means the app is exiting, so there is nothing to report
+            if not future.cancelled():
+                self.root.after(0, on_complete, future.exception())
+
+        self.check_future = asyncio.run_coroutine_threadsafe(run_checks(), self.loop)
+        self.check_future.add_done_callback(on_done)
 
     def ask_delete_invalid_bookmarks(self):
         """Ask user whether to delete invalid bookmarks"""
         invalid_count = len(self.invalid_bookmarks)
         message = f"Check completed, found {invalid_count} invalid bookmarks:\n\n"
-        for _, path in self.invalid_bookmarks[:10]:
-            message += f"- Location: {path}\n"
+        for i in self.invalid_bookmarks[:10]:
+            message += f"- Location: {self.paths[i]}\n"
         if invalid_count > 10:
             message += f"\n... and {invalid_count - 10} more\n"
         message += "\nDelete these invalid bookmarks?"
         
         if messagebox.askyesno("Invalid Bookmarks", message):
-            for a_tag, _ in self.invalid_bookmarks:
-                a_tag.decompose()
+            self.remove_tags([self.a_tags[i] for i in self.invalid_bookmarks])
             self.log(f"Deleted {invalid_count} invalid bookmarks!")
 
     def safe_exit(self):
-        """Safe exit, terminate all threads"""
-        if self.is_running:
+        """Safe exit, cancelling any validity check still in flight"""
+        checking = self.check_future is not None and not self.check_future.done()
+        # Loading or saving a file is not interrupted, so a save is never left half-written
+        if self.is_running and not checking:
             messagebox.showwarning("Warning", "Operation in progress, please wait!")
             return
-        self.root.quit()
+        if checking:
+            self.check_future.cancel()
+        closing = asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop)
+        # Give the session a moment to close its sockets, but never block exit on it
+        wait_futures([closing], timeout=1)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def find_duplicate_bookmarks(self):
         """Find duplicate bookmarks and ask whether to delete (considering folder structure)"""
@@ -188,31 +394,30 @@ class BookmarkManager:
 
         self.is_running = True
         self.duplicate_bookmarks = []
-        bookmarks = defaultdict(list)
+        a_tags = self.get_a_tags()
 
-        # Collect all bookmarks with their path information
-        for a_tag in self.soup.find_all("a"):
-            title = a_tag.text.strip()
-            href = a_tag.get("href")
-            path = self.get_bookmark_path(a_tag)
-            bookmarks[(title, href)].append((a_tag, path))
+        # Compare titles and URLs ignoring case and trailing slashes
+        titles = [(a_tag.string or a_tag.get_text()).strip().casefold() for a_tag in a_tags]
+        hrefs = [(a_tag.get("href") or "").rstrip("/").casefold() for a_tag in a_tags]
 
-        # Find duplicates
-        for (title, href), tags_with_paths in bookmarks.items():
-            if len(tags_with_paths) > 1:
-                self.duplicate_bookmarks.append((title, href, tags_with_paths))
+        for indexes in group_by_pair(titles, hrefs).values():
+            first = a_tags[indexes[0]]
+            self.duplicate_bookmarks.append((first.get_text().strip(), first.get("href"), indexes))
 
         self.is_running = False
 
         if self.duplicate_bookmarks:
             self.log(f"Found {len(self.duplicate_bookmarks)} duplicate bookmarks.")
-            for title, href, tags_with_paths in self.duplicate_bookmarks:
-                paths_info = "\n".join([f"- Location: {path}" for _, path in tags_with_paths])
+            to_remove = []
+            for title, href, indexes in self.duplicate_bookmarks:
+                # Paths are only computed for the bookmarks being shown
+                paths_info = "\n".join([f"- Location: {self.get_bookmark_path(a_tags[i])}" for i in indexes])
                 if messagebox.askyesno("Duplicate Bookmarks", 
-                    f"Bookmark '{title}' ({href}) has {len(tags_with_paths)} duplicates:\n{paths_info}\n\nDelete duplicates?"):
+                    f"Bookmark '{title}' ({href}) has {len(indexes)} duplicates:\n{paths_info}\n\nDelete duplicates?"):
                     # Keep first one, delete others
-                    for tag, _ in tags_with_paths[1:]:
-                        tag.decompose()
+                    to_remove.extend(a_tags[i] for i in indexes[1:])
+            if to_remove:
+                self.remove_tags(to_remove)
             self.log("Duplicate processing completed!")
         else:
             self.log("No duplicate bookmarks found.")
@@ -224,39 +429,41 @@ class BookmarkManager:
             return
 
         cutoff_date = datetime.now() - timedelta(days=180)
+        a_tags = self.get_a_tags()
         old_bookmarks = []
 
-        # Collect all old bookmarks and their paths
-        for a_tag in self.soup.find_all("a"):
+        # Collect indexes of all old bookmarks
+        for i, a_tag in enumerate(a_tags):
             add_date = a_tag.get("add_date")
             if add_date and datetime.fromtimestamp(int(add_date)) < cutoff_date:
-                path = self.get_bookmark_path(a_tag)
-                old_bookmarks.append((a_tag, path))
+                old_bookmarks.append(i)
 
         if old_bookmarks:
             message = f"Found {len(old_bookmarks)} bookmarks older than 6 months:\n\n"
-            for _, path in old_bookmarks[:10]:
-                message += f"- Location: {path}\n"
+            for i in old_bookmarks[:10]:
+                message += f"- Location: {self.get_bookmark_path(a_tags[i])}\n"
             if len(old_bookmarks) > 10:
                 message += f"\n... and {len(old_bookmarks) - 10} more\n"
             message += "\nDelete these bookmarks?"
             
             if messagebox.askyesno("Old Bookmarks", message):
-                for a_tag, _ in old_bookmarks:
-                    a_tag.decompose()
+                self.remove_tags([a_tags[i] for i in old_bookmarks])
                 self.log(f"Successfully removed {len(old_bookmarks)} old bookmarks!")
         else:
             self.log("No bookmarks older than 6 months found.")
 
     def save_bookmarks(self):
         """Save bookmarks file (maintaining folder structure)"""
+        if self.is_running:
+            messagebox.showwarning("Warning", "Operation in progress, please wait!")
+            return
         if not self.soup:
             self.log("Please load a bookmarks file first!")
             return
         
         # Check folder structure integrity
         folders = self.soup.find_all("h3")
-        dls = self.soup.find_all("dl")
+        dls = self.dl_tags
         
         if not folders or not dls:
             self.log("Warning: Bookmark folder structure might be corrupted!")
@@ -268,18 +475,33 @@ class BookmarkManager:
             filetypes=[("HTML files", "*.html")],
             initialfile="bookmarks.html"
         )
-        if file_path:
+        if not file_path:
+            return
+
+        self.is_running = True
+
+        def do_save():
             try:
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(str(self.soup))
-                self.log(f"Bookmarks file saved to: {file_path}")
-                
-                # Show folder structure statistics
-                folder_count = len(folders)
-                bookmark_count = len(self.soup.find_all("a"))
-                self.log(f"Contains {folder_count} folders, {bookmark_count} bookmarks.")
+                with open(file_path, "wb") as file:
+                    file.write(self.soup.encode("utf-8", formatter="minimal"))
             except Exception as e:
-                self.log(f"Error saving file: {e}")
+                self.root.after(0, on_saved, e)
+            else:
+                self.root.after(0, on_saved, None)
+
+        def on_saved(error):
+            self.is_running = False
+            if error is not None:
+                self.log(f"Error saving file: {error}")
+                return
+            self.log(f"Bookmarks file saved to: {file_path}")
+
+            # Show folder structure statistics
+            folder_count = len(folders)
+            bookmark_count = len(self.get_a_tags())
+            self.log(f"Contains {folder_count} folders, {bookmark_count} bookmarks.")
+
+        threading.Thread(target=do_save, daemon=True).start()
 
     def process_bookmarks(self, action):
         """Process bookmarks based on selected action"""